@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
 """
-Token Quest Backend - Main Flask Application
+Token Quest Backend - Main Quart Application
 
-A lightweight Flask backend that provides Web3 integration for token swaps
+A lightweight async Quart backend that provides Web3 integration for token swaps
 on BSC testnet using PancakeSwap V2 router.
 
 Features:
@@ -13,25 +13,148 @@ Features:
 """
 
 import os
-from flask import Flask, request, jsonify
-from flask_cors import CORS
+import re
+import json
+import hmac
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from functools import wraps
+from typing import Any, Type, Union
+import orjson
+from pydantic import BaseModel, ValidationError
+from quart import Quart, Response, request, jsonify
+from quart.json.provider import JSONProvider
 from swap_service import SwapService
+from schemas import (
+    QuoteRequest, SwapRequest, TokenInfoRequest, TokenInfosRequest, WalletRequest
+)
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-app = Flask(__name__)
+# Handlers only enqueue log records; a background thread does the stream I/O
+log_queue = queue.SimpleQueue()
+log_stream_handler = logging.StreamHandler()
+log_stream_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+log_queue_handler = QueueHandler(log_queue)
+log_queue_handler.setFormatter(logging.Formatter('%(message)s'))  # formatted by the listener
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO').upper(), handlers=[log_queue_handler])
 
-# Configure CORS for frontend integration
-cors_origin = os.getenv('CORS_ORIGIN', 'http://localhost:3000')
-CORS(app, origins=[cors_origin])
+def start_log_listener():
+    """Start the thread draining the log queue (again in each forked worker)"""
+    log_listener = QueueListener(log_queue, log_stream_handler)
+    log_listener.start()
+    atexit.register(log_listener.stop)
+
+start_log_listener()
+
+logger = logging.getLogger(__name__)
+
+class ORJSONProvider(JSONProvider):
+    """
+    JSON provider that serializes responses with orjson
+    
+    Wei amounts are already returned as strings, so orjson's 64-bit integer
+    limit does not apply to responses. Request bodies are parsed with the
+    stdlib, since orjson turns integers above 64 bits into floats and would
+    silently round wei amounts sent as JSON numbers.
+    """
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj).decode()
+    
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        return json.loads(s, **kwargs)
+    
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        # Hand orjson's bytes straight to the response without a str round trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype='application/json')
+
+class TokenQuestApp(Quart):
+    """Quart application using orjson for JSON responses"""
+    json_provider_class = ORJSONProvider
+
+app = TokenQuestApp(__name__)
+
+# Preflights are answered by the catch-all OPTIONS route below
+app.config['PROVIDE_AUTOMATIC_OPTIONS'] = False
+
+# Configure CORS for frontend integration: the comma-separated allowlist is
+# compiled into one anchored regex, checked once per request ('*' allows any origin)
+cors_origins = [origin.strip() for origin in os.getenv('CORS_ORIGIN', 'http://localhost:3000').split(',')]
+CORS_ALLOW_ALL = '*' in cors_origins
+CORS_ORIGIN_RE = re.compile('^(?:' + '|'.join(re.escape(origin) for origin in cors_origins if origin) + ')$')
 
 # Initialize swap service
 swap_service = SwapService()
 
+# Token required by internal maintenance endpoints (disabled when unset)
+admin_token = os.getenv('ADMIN_TOKEN')
+
+def validate_body(model: Type[BaseModel]):
+    """
+    Parse the JSON body into `model` and pass it to the view as its first argument
+    
+    Malformed or missing payloads are answered with a 400 JSON error.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(*args, **kwargs):
+            try:
+                body = model.model_validate(await request.get_json(silent=True))
+            except ValidationError as e:
+                details = '; '.join(
+                    f"{'.'.join(str(part) for part in error['loc']) or 'body'}: {error['msg']}"
+                    for error in e.errors()
+                )
+                return jsonify({
+                    'success': False,
+                    'error': f'Invalid request: {details}'
+                }), 400
+            
+            return await view(body, *args, **kwargs)
+        return wrapper
+    return decorator
+
+@app.before_serving
+async def connect_swap_service():
+    """Verify the Web3 connection once the event loop is running"""
+    await swap_service.connect()
+
+@app.after_serving
+async def close_swap_service():
+    """Stop the swap service's background tasks"""
+    await swap_service.close()
+
+@app.after_request
+async def add_cors_headers(response):
+    """Add CORS headers for allowlisted origins"""
+    # Headers depend on the Origin even when it is not allowed, so shared
+    # caches must key every response on it
+    response.vary.add('Origin')
+    
+    origin = request.headers.get('Origin')
+    if origin and (CORS_ALLOW_ALL or CORS_ORIGIN_RE.match(origin)):
+        response.headers['Access-Control-Allow-Origin'] = '*' if CORS_ALLOW_ALL else origin
+        if request.method == 'OPTIONS':
+            response.headers['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
+            response.headers['Access-Control-Allow-Headers'] = 'Content-Type'
+            response.headers['Access-Control-Max-Age'] = '86400'
+    
+    return response
+
+@app.route('/', defaults={'path': ''}, methods=['OPTIONS'])
+@app.route('/<path:path>', methods=['OPTIONS'])
+async def preflight(path):
+    """Answer CORS preflight requests without dispatching to a view"""
+    return '', 204
+
 @app.route('/health', methods=['GET'])
-def health_check():
+async def health_check():
     """
     Health check endpoint to verify backend is running
     
@@ -46,30 +169,28 @@ def health_check():
     })
 
 @app.route('/api/validate-wallet', methods=['POST'])
-def validate_wallet():
+@validate_body(WalletRequest)
+async def validate_wallet(body: WalletRequest):
     """
     Validate wallet address format and connection
     
     Expected JSON payload:
     {
-        "address": "0x..."
+        "address": "0x...",
+        "includeBalance": true,  // Optional, false skips the RPC balance lookup
+        "includeTokens": false  // Optional, also return common token balances
     }
     
     Returns:
         dict: Validation result and wallet info
     """
     try:
-        data = request.get_json()
-        address = data.get('address')
-        
-        if not address:
-            return jsonify({
-                'success': False,
-                'error': 'Wallet address is required'
-            }), 400
-        
-        # Validate address format and get balance
-        result = swap_service.validate_wallet(address)
+        # Malformed addresses were already rejected without an RPC round trip
+        result = await swap_service.validate_wallet(
+            body.address,
+            include_balance=body.includeBalance,
+            include_tokens=body.includeTokens
+        )
         
         return jsonify(result)
         
@@ -80,7 +201,8 @@ def validate_wallet():
         }), 500
 
 @app.route('/api/get-quote', methods=['POST'])
-def get_swap_quote():
+@validate_body(QuoteRequest)
+async def get_swap_quote(body: QuoteRequest):
     """
     Get quote for token swap using PancakeSwap router
     
@@ -95,19 +217,8 @@ def get_swap_quote():
         dict: Quote information including expected output
     """
     try:
-        data = request.get_json()
-        token_in = data.get('tokenIn')
-        token_out = data.get('tokenOut')
-        amount_in = data.get('amountIn')
-        
-        if not all([token_in, token_out, amount_in]):
-            return jsonify({
-                'success': False,
-                'error': 'Missing required parameters: tokenIn, tokenOut, amountIn'
-            }), 400
-        
         # Get swap quote from PancakeSwap
-        quote = swap_service.get_swap_quote(token_in, token_out, amount_in)
+        quote = await swap_service.get_swap_quote(body.tokenIn, body.tokenOut, str(body.amountIn))
         
         return jsonify(quote)
         
@@ -118,7 +229,8 @@ def get_swap_quote():
         }), 500
 
 @app.route('/api/execute-swap', methods=['POST'])
-def execute_swap():
+@validate_body(SwapRequest)
+async def execute_swap(body: SwapRequest):
     """
     Execute token swap transaction
     
@@ -128,40 +240,36 @@ def execute_swap():
         "tokenIn": "0x...",
         "tokenOut": "0x...",
         "amountIn": "1000000000000000000",
-        "slippage": 0.5  // Percentage
+        "slippage": 0.5,  // Percentage
+        "expectedAmountOut": "...",  // Optional, from /api/get-quote
+        "quoteBlock": 123,  // Optional, from /api/get-quote
+        "quoteSignature": "..."  // Optional, from /api/get-quote
     }
     
     Returns:
         dict: Transaction result and XP earned
     """
     try:
-        data = request.get_json()
-        wallet_address = data.get('walletAddress')
-        token_in = data.get('tokenIn')
-        token_out = data.get('tokenOut')
-        amount_in = data.get('amountIn')
-        slippage = data.get('slippage', 0.5)
-        
-        if not all([wallet_address, token_in, token_out, amount_in]):
-            return jsonify({
-                'success': False,
-                'error': 'Missing required parameters'
-            }), 400
+        amount_in = str(body.amountIn)
         
         # Execute the swap
-        result = swap_service.execute_swap(
-            wallet_address=wallet_address,
-            token_in=token_in,
-            token_out=token_out,
+        result = await swap_service.execute_swap(
+            wallet_address=body.walletAddress,
+            token_in=body.tokenIn,
+            token_out=body.tokenOut,
             amount_in=amount_in,
-            slippage=slippage
+            slippage=body.slippage,
+            expected_amount_out=body.expectedAmountOut,
+            quote_block=body.quoteBlock,
+            quote_signature=body.quoteSignature
         )
         
         # Calculate XP reward based on swap value
         if result['success']:
             # Base XP: 10, Bonus based on amount
             base_xp = 10
-            amount_bonus = min(int(float(amount_in)) // 10**18, 50)  # Max 50 bonus
+            # Integer-only: float() loses precision on wei amounts above 2**53
+            amount_bonus = min(body.amountIn // 10**18, 50)  # Max 50 bonus
             total_xp = base_xp + amount_bonus
             
             result['xp_earned'] = total_xp
@@ -176,7 +284,8 @@ def execute_swap():
         }), 500
 
 @app.route('/api/token-info', methods=['POST'])
-def get_token_info():
+@validate_body(TokenInfoRequest)
+async def get_token_info(body: TokenInfoRequest):
     """
     Get information about a specific token
     
@@ -185,21 +294,17 @@ def get_token_info():
         "tokenAddress": "0x..."
     }
     
+    Query parameters:
+        refresh=1 bypasses the token info cache
+    
     Returns:
         dict: Token information (symbol, decimals, name)
     """
     try:
-        data = request.get_json()
-        token_address = data.get('tokenAddress')
-        
-        if not token_address:
-            return jsonify({
-                'success': False,
-                'error': 'Token address is required'
-            }), 400
+        refresh = request.args.get('refresh') == '1'
         
         # Get token information
-        token_info = swap_service.get_token_info(token_address)
+        token_info = await swap_service.get_token_info(body.tokenAddress, refresh=refresh)
         
         return jsonify(token_info)
         
@@ -209,8 +314,62 @@ def get_token_info():
             'error': f'Failed to get token info: {str(e)}'
         }), 500
 
+@app.route('/api/token-infos', methods=['POST'])
+@validate_body(TokenInfosRequest)
+async def get_token_infos(body: TokenInfosRequest):
+    """
+    Get information about several tokens in one batched lookup
+    
+    Expected JSON payload:
+    {
+        "tokenAddresses": ["0x...", "0x..."]  // Up to 50 addresses
+    }
+    
+    Query parameters:
+        refresh=1 bypasses the token info cache
+    
+    Returns:
+        dict: List of token information (symbol, decimals, name)
+    """
+    try:
+        refresh = request.args.get('refresh') == '1'
+        
+        # Get token information for all addresses in one RPC
+        token_infos = await swap_service.get_token_infos(body.tokenAddresses, refresh=refresh)
+        
+        return jsonify(token_infos)
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Failed to get token info: {str(e)}'
+        }), 500
+
+@app.route('/api/_flush', methods=['POST'])
+async def flush_caches():
+    """
+    Internal endpoint to clear the token info and quote caches
+    
+    Requires the X-Admin-Token header to match ADMIN_TOKEN.
+    
+    Returns:
+        dict: Flush result
+    """
+    # Constant-time comparison so response timing does not leak the token
+    # (as bytes, since compare_digest rejects non-ASCII str)
+    supplied_token = request.headers.get('X-Admin-Token', '').encode()
+    if not admin_token or not hmac.compare_digest(supplied_token, admin_token.encode()):
+        return jsonify({
+            'success': False,
+            'error': 'Endpoint not found'
+        }), 404
+    
+    swap_service.flush_caches()
+    
+    return jsonify({'success': True})
+
 @app.errorhandler(404)
-def not_found(error):
+async def not_found(error):
     """Handle 404 errors"""
     return jsonify({
         'success': False,
@@ -218,7 +377,7 @@ def not_found(error):
     }), 404
 
 @app.errorhandler(500)
-def internal_error(error):
+async def internal_error(error):
     """Handle 500 errors"""
     return jsonify({
         'success': False,
@@ -230,8 +389,8 @@ if __name__ == '__main__':
     port = int(os.getenv('PORT', 5000))
     debug = os.getenv('FLASK_ENV') == 'development'
     
-    print(f"🚀 Token Quest Backend starting on port {port}")
-    print(f"🌐 Network: BSC Testnet")
-    print(f"🎮 Ready for treasure hunting!")
+    logger.info("🚀 Token Quest Backend starting on port %s", port)
+    logger.info("🌐 Network: BSC Testnet")
+    logger.info("🎮 Ready for treasure hunting!")
     
     app.run(host='0.0.0.0', port=port, debug=debug)
\ No newline at end of file
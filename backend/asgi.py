@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""
+Token Quest Backend - ASGI Entrypoint
+
+Production entrypoint for the Quart app. Run it with gunicorn managing
+uvicorn workers (uvloop event loop, see gunicorn.conf.py):
+
+    gunicorn -c gunicorn.conf.py asgi:app
+"""
+
+from app import app
+
+__all__ = ['app']
@@ -0,0 +1,36 @@
+"""
+Token Quest Backend - Gunicorn Configuration
+
+Runs the async Quart app under uvicorn workers so in-flight RPC waits
+overlap inside each worker, with one worker process per core.
+"""
+
+import multiprocessing
+import os
+
+# Import the app once in the master and fork workers from it, so module
+# state (ABIs, checksum cache, quote signing key) is shared copy-on-write.
+# SwapService opens no sockets until connect() runs in each worker.
+preload_app = True
+
+# Bind to the same port as the development server
+bind = f"0.0.0.0:{os.getenv('PORT', 5000)}"
+
+# One event loop per process; uvicorn picks uvloop when it is installed
+worker_class = 'uvicorn.workers.UvicornWorker'
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+
+# RPC calls time out after 10 s, leave headroom for retries
+timeout = 30
+graceful_timeout = 30
+keepalive = 5
+
+# Log to stdout/stderr for container platforms
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('LOG_LEVEL', 'INFO').lower()
+
+def post_fork(server, worker):
+    """Restart the log queue listener; its thread does not survive fork"""
+    import app
+    app.start_log_listener()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Token Quest - Request Schemas
+
+Pydantic v2 models for the JSON payloads accepted by the API endpoints.
+Validation runs in pydantic-core, and every endpoint reports malformed
+payloads the same way (see validate_body in app.py).
+
+Field names match the camelCase keys sent by the frontend.
+"""
+
+from typing import Annotated, List, Optional
+from pydantic import AfterValidator, BaseModel, Field
+from web3 import Web3
+
+# Maximum number of tokens per batched token-info request
+MAX_TOKEN_INFOS = 50
+
+# Hex address, normalized to its EIP-55 checksum form
+Address = Annotated[str, AfterValidator(Web3.to_checksum_address)]
+
+# Non-negative token amount in wei (accepts JSON numbers or digit strings)
+WeiAmount = Annotated[int, Field(ge=0)]
+
+class WalletRequest(BaseModel):
+    """Payload for /api/validate-wallet"""
+    address: Address
+    includeBalance: bool = True
+    includeTokens: bool = False
+
+class QuoteRequest(BaseModel):
+    """Payload for /api/get-quote"""
+    tokenIn: Address
+    tokenOut: Address
+    amountIn: WeiAmount
+
+class SwapRequest(QuoteRequest):
+    """Payload for /api/execute-swap"""
+    walletAddress: Address
+    slippage: float = Field(0.5, ge=0, lt=100)
+    expectedAmountOut: Optional[WeiAmount] = None
+    quoteBlock: Optional[int] = None
+    quoteSignature: Optional[str] = Field(None, pattern=r'^[0-9a-f]{64}$')  # hex HMAC-SHA256
+
+class TokenInfoRequest(BaseModel):
+    """Payload for /api/token-info"""
+    tokenAddress: Address
+
+class TokenInfosRequest(BaseModel):
+    """Payload for /api/token-infos"""
+    tokenAddresses: List[Address] = Field(min_length=1, max_length=MAX_TOKEN_INFOS)
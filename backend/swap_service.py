@@ -14,10 +14,87 @@ Features:
 """
 
 import os
-from web3 import Web3
-from web3.middleware import geth_poa_middleware
+import asyncio
+import logging
+import hashlib
+import hmac
+import secrets
+from functools import cached_property, lru_cache
+from aiohttp import ClientError, ClientResponseError, ClientSession, ClientTimeout, TCPConnector
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
+from web3 import AsyncWeb3, Web3
+from web3.middleware import async_geth_poa_middleware
+from web3.providers import WebsocketProviderV2
+from eth_abi import decode
+from eth_abi.exceptions import DecodingError
+from cachetools import LRUCache, TTLCache
 import json
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bind the web3 utility helpers once; they run per address / per result in
+# the request path, so skip the repeated class attribute lookups
+_from_wei = Web3.from_wei
+_is_address = Web3.is_address
+
+# EIP-55 checksumming hashes the address with keccak256; memoize it since
+# the same handful of token and wallet addresses come up on every request
+_to_cksum = lru_cache(maxsize=8192)(Web3.to_checksum_address)
+
+def _is_transient_rpc_error(error: BaseException) -> bool:
+    """Whether a failed RPC is worth retrying (connection drops, timeouts, 5xx/429)"""
+    if isinstance(error, ClientResponseError):
+        return error.status >= 500 or error.status == 429
+    return isinstance(error, (ClientError, asyncio.TimeoutError))
+
+# Retry transient RPC failures with jittered exponential backoff; reverts and
+# other 4xx responses are deterministic and not retried
+_retry_rpc = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_random_exponential(multiplier=0.05, max=0.5),
+    retry=retry_if_exception(_is_transient_rpc_error),
+    reraise=True
+)
+
+# Function selector for the router's getAmountsOut(uint256,address[])
+GET_AMOUNTS_OUT_SELECTOR = bytes(Web3.keccak(text='getAmountsOut(uint256,address[])')[:4])
+
+# BSC produces a block roughly every 3 seconds
+BLOCK_TIME_SECONDS = 3
+
+# After a WebSocket failure, poll over HTTP this long before reconnecting
+WS_RETRY_SECONDS = 60
+
+# Treat a newHeads subscription silent for this long as stalled
+WS_IDLE_TIMEOUT_SECONDS = 5 * BLOCK_TIME_SECONDS
+
+# A signed quote may be reused by execute_swap for this many blocks
+QUOTE_MAX_AGE_BLOCKS = 2
+
+# ERC20 metadata fields fetched for each token, with their ABI return types
+TOKEN_INFO_FIELDS = (('name', 'string'), ('symbol', 'string'), ('decimals', 'uint8'))
+
+def _encode_get_amounts_out(amount_in: int, path: List[str]) -> bytes:
+    """
+    Encode getAmountsOut calldata without going through the contract ABI layer
+    
+    Layout: selector | amountIn | offset of path (0x40) | path length | addresses
+    
+    Args:
+        amount_in (int): Input amount in wei
+        path (List[str]): Checksummed token addresses
+        
+    Returns:
+        ABI-encoded calldata
+    """
+    return b''.join([
+        GET_AMOUNTS_OUT_SELECTOR,
+        amount_in.to_bytes(32, 'big'),
+        (0x40).to_bytes(32, 'big'),
+        len(path).to_bytes(32, 'big'),
+        *(bytes(12) + bytes.fromhex(address[2:]) for address in path)
+    ])
 
 class SwapService:
     """
@@ -26,23 +103,22 @@ class SwapService:
     
     def __init__(self):
         """
-        Initialize Web3 connection and contract interfaces
+        Initialize configuration, contract ABIs and caches
         """
         # BSC Testnet configuration
         self.web3_provider_url = os.getenv('WEB3_PROVIDER_URL', 'https://data-seed-prebsc-1-s1.binance.org:8545/')
         self.pancakeswap_router = os.getenv('PANCAKESWAP_ROUTER', '0x9Ac64Cc6e4415144C455BD8E4837Fea55603e5c3')
+        self.multicall3_address = os.getenv('MULTICALL3_ADDRESS', '0xcA11bde05977b3631167028862bE2a173976CA11')
         
-        # Initialize Web3
-        self.w3 = Web3(Web3.HTTPProvider(self.web3_provider_url))
-        
-        # Add PoA middleware for BSC
-        self.w3.middleware_onion.inject(geth_poa_middleware, layer=0)
+        # Optional WebSocket endpoint used to receive new block headers by push
+        self.web3_ws_provider_url = os.getenv('WEB3_WS_PROVIDER_URL')
         
-        # Verify connection
-        if not self.w3.is_connected():
-            raise Exception("Failed to connect to BSC testnet")
+        # Key for signing quotes handed to the frontend (random per process if unset)
+        secret_key = os.getenv('SECRET_KEY')
+        self._quote_signing_key = secret_key.encode() if secret_key else secrets.token_bytes(32)
         
-        print(f"✅ Connected to BSC Testnet. Latest block: {self.w3.eth.block_number}")
+        # Keep-alive HTTP session shared by all RPC calls, created in connect()
+        self._http_session: Optional[ClientSession] = None
         
         # PancakeSwap Router ABI (minimal)
         self.router_abi = [
@@ -94,11 +170,33 @@ class SwapService:
             }
         ]
         
-        # Initialize router contract
-        self.router_contract = self.w3.eth.contract(
-            address=Web3.to_checksum_address(self.pancakeswap_router),
-            abi=self.router_abi
-        )
+        # Multicall3 ABI (minimal) - batches many eth_calls into one RPC round trip
+        self.multicall_abi = [
+            {
+                "inputs": [{"components": [{"internalType": "address", "name": "target", "type": "address"}, {"internalType": "bool", "name": "allowFailure", "type": "bool"}, {"internalType": "bytes", "name": "callData", "type": "bytes"}], "internalType": "struct Multicall3.Call3[]", "name": "calls", "type": "tuple[]"}],
+                "name": "aggregate3",
+                "outputs": [{"components": [{"internalType": "bool", "name": "success", "type": "bool"}, {"internalType": "bytes", "name": "returnData", "type": "bytes"}], "internalType": "struct Multicall3.Result[]", "name": "returnData", "type": "tuple[]"}],
+                "stateMutability": "payable",
+                "type": "function"
+            },
+            {
+                "inputs": [{"internalType": "address", "name": "addr", "type": "address"}],
+                "name": "getEthBalance",
+                "outputs": [{"internalType": "uint256", "name": "balance", "type": "uint256"}],
+                "stateMutability": "view",
+                "type": "function"
+            }
+        ]
+        
+        # Token metadata is immutable on-chain, so successful lookups are kept
+        self._token_info_cache = LRUCache(maxsize=4096)
+        
+        # Pool reserves only change between blocks, so quotes live for one block
+        self._quote_cache = TTLCache(maxsize=8192, ttl=BLOCK_TIME_SECONDS)
+        
+        # Latest block number, kept fresh by a background task
+        self.current_block: Optional[int] = None
+        self._block_watcher: Optional[asyncio.Task] = None
         
         # Common testnet token addresses
         self.common_tokens = {
@@ -107,38 +205,328 @@ class SwapService:
             'USDT': '0x7ef95a0FEE0Dd31b22626fF2be2D0E3c5e4D5DC'  # Example testnet USDT
         }
     
-    def validate_wallet(self, address: str) -> Dict[str, Any]:
+    # Web3 objects are built lazily (first touched in connect()) so that a
+    # SwapService created in a preloading gunicorn master holds no provider
+    # state at fork time; each worker builds its own.
+    
+    @cached_property
+    def w3(self) -> AsyncWeb3:
+        """
+        Async Web3 instance, so RPC round trips don't block the event loop
+        """
+        w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(
+            self.web3_provider_url,
+            request_kwargs={'timeout': ClientTimeout(total=10)}
+        ))
+        
+        # Add PoA middleware for BSC
+        w3.middleware_onion.inject(async_geth_poa_middleware, layer=0)
+        
+        return w3
+    
+    @cached_property
+    def router_contract(self):
+        """
+        PancakeSwap router contract
+        """
+        return self.w3.eth.contract(
+            address=_to_cksum(self.pancakeswap_router),
+            abi=self.router_abi
+        )
+    
+    @cached_property
+    def multicall_contract(self):
+        """
+        Multicall3 contract
+        """
+        return self.w3.eth.contract(
+            address=_to_cksum(self.multicall3_address),
+            abi=self.multicall_abi
+        )
+    
+    @cached_property
+    def erc20_contract(self):
+        """
+        Address-less ERC20 contract, used only to encode calldata
+        """
+        return self.w3.eth.contract(abi=self.token_abi)
+    
+    @cached_property
+    def token_info_calldata(self) -> List[str]:
+        """
+        Calldata for the ERC20 metadata getters (constant, they take no arguments)
+        """
+        return [
+            self.erc20_contract.encodeABI(fn_name=field) for field, _ in TOKEN_INFO_FIELDS
+        ]
+    
+    async def connect(self) -> None:
+        """
+        Verify the RPC connection (must run inside the server's event loop)
+        
+        Raises:
+            Exception: If the BSC testnet node is unreachable
+        """
+        # Reuse pooled keep-alive connections instead of a TLS handshake per call
+        self._http_session = ClientSession(
+            connector=TCPConnector(limit=100, keepalive_timeout=75),
+            raise_for_status=True
+        )
+        await self.w3.provider.cache_async_session(self._http_session)
+        
+        if not await self.w3.is_connected():
+            raise Exception("Failed to connect to BSC testnet")
+        
+        self.current_block = await self.w3.eth.block_number
+        logger.info("✅ Connected to BSC Testnet. Latest block: %s", self.current_block)
+        
+        # Track new blocks off the request path
+        self._block_watcher = asyncio.create_task(self._watch_blocks())
+        
+        # Pre-warm the token info cache with the common tokens
+        await self.get_token_infos([
+            address for address in self.common_tokens.values() if _is_address(address)
+        ])
+    
+    async def close(self) -> None:
+        """
+        Stop background tasks and close the HTTP session opened by connect()
+        """
+        if self._block_watcher is not None:
+            self._block_watcher.cancel()
+            self._block_watcher = None
+        
+        if self._http_session is not None:
+            await self._http_session.close()
+            self._http_session = None
+    
+    async def _watch_blocks(self) -> None:
+        """
+        Follow new blocks, over a newHeads subscription when a WebSocket
+        endpoint is configured, falling back to HTTP polling
+        """
+        while True:
+            if self.web3_ws_provider_url:
+                try:
+                    await self._subscribe_new_heads()
+                except Exception as e:
+                    logger.warning("⚠️ newHeads subscription failed, polling over HTTP: %s", e)
+                
+                await self._poll_blocks(WS_RETRY_SECONDS)
+            else:
+                await self._poll_blocks()
+    
+    async def _subscribe_new_heads(self) -> None:
+        """
+        Receive block headers pushed over a WebSocket newHeads subscription
+        """
+        provider = WebsocketProviderV2(self.web3_ws_provider_url)
+        async with AsyncWeb3.persistent_websocket(provider) as ws_w3:
+            await ws_w3.eth.subscribe('newHeads')
+            logger.info("✅ Subscribed to newHeads at %s", self.web3_ws_provider_url)
+            
+            # A stream can stall without closing (e.g. behind a load balancer),
+            # so bound each receive and fall back to polling when it goes quiet
+            messages = ws_w3.ws.listen_to_websocket().__aiter__()
+            while True:
+                try:
+                    message = await asyncio.wait_for(messages.__anext__(), WS_IDLE_TIMEOUT_SECONDS)
+                except StopAsyncIteration:
+                    break
+                except asyncio.TimeoutError:
+                    raise ConnectionError(
+                        f'no newHeads received for {WS_IDLE_TIMEOUT_SECONDS}s'
+                    ) from None
+                
+                block_number = message['result']['number']
+                if isinstance(block_number, str):
+                    block_number = int(block_number, 16)
+                self._on_new_block(block_number)
+        
+        raise ConnectionError('newHeads subscription closed')
+    
+    async def _poll_blocks(self, duration: Optional[float] = None) -> None:
+        """
+        Poll the latest block number over HTTP
+        
+        Args:
+            duration (Optional[float]): Seconds to poll for, forever if None
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if duration is None else loop.time() + duration
+        
+        while deadline is None or loop.time() < deadline:
+            await asyncio.sleep(BLOCK_TIME_SECONDS)
+            try:
+                self._on_new_block(await self.w3.eth.block_number)
+            except Exception as e:
+                logger.warning("⚠️ Failed to fetch latest block: %s", e)
+    
+    def _on_new_block(self, block_number: int) -> None:
+        """
+        Record the latest block and drop quotes taken against older state
+        
+        Args:
+            block_number (int): Latest block number
+        """
+        if block_number != self.current_block:
+            self.current_block = block_number
+            self._quote_cache.clear()
+    
+    def flush_caches(self) -> None:
+        """
+        Clear all cached token info and quotes
+        """
+        self._token_info_cache.clear()
+        self._quote_cache.clear()
+    
+    def _sign_quote(self, token_in: str, token_out: str, amount_in: int,
+                    amount_out: int, quote_block: Optional[int]) -> str:
+        """
+        Sign the fields of a quote so the frontend can hand it back untampered
+        
+        Args:
+            token_in (str): Checksummed input token address
+            token_out (str): Checksummed output token address
+            amount_in (int): Input amount in wei
+            amount_out (int): Quoted output amount in wei
+            quote_block (Optional[int]): Block the quote was taken at
+            
+        Returns:
+            Hex-encoded HMAC-SHA256 signature
+        """
+        message = f"{token_in}:{token_out}:{amount_in}:{amount_out}:{quote_block}"
+        return hmac.new(self._quote_signing_key, message.encode(), hashlib.sha256).hexdigest()
+    
+    def _reusable_quote_amount(self, token_in: str, token_out: str, amount_in: int,
+                               expected_amount_out: Optional[int], quote_block: Optional[int],
+                               quote_signature: Optional[str]) -> Optional[int]:
+        """
+        Return the quoted output amount if a signed quote is still fresh
+        
+        Args:
+            token_in (str): Checksummed input token address
+            token_out (str): Checksummed output token address
+            amount_in (int): Input amount in wei
+            expected_amount_out (Optional[int]): Output amount from the quote, in wei
+            quote_block (Optional[int]): Block the quote was taken at
+            quote_signature (Optional[str]): Signature returned with the quote
+            
+        Returns:
+            The output amount in wei, or None if the quote must be refetched
+        """
+        if expected_amount_out is None or quote_block is None or not quote_signature:
+            return None
+        
+        if self.current_block is None or self.current_block - int(quote_block) >= QUOTE_MAX_AGE_BLOCKS:
+            return None
+        
+        signature = self._sign_quote(token_in, token_out, amount_in, expected_amount_out, int(quote_block))
+        # Compared as bytes, since compare_digest rejects non-ASCII str
+        if not hmac.compare_digest(signature.encode(), quote_signature.encode()):
+            return None
+        
+        return expected_amount_out
+    
+    @_retry_rpc
+    async def _get_amounts_out(self, amount_in: int, path: List[str]) -> int:
+        """
+        Query the router for the final output amount along a swap path
+        
+        Args:
+            amount_in (int): Input amount in wei
+            path (List[str]): Checksummed token addresses
+            
+        Returns:
+            Output amount of the last token in the path, in wei
+        """
+        result = await self.w3.eth.call({
+            'to': self.router_contract.address,
+            'data': _encode_get_amounts_out(amount_in, path)
+        })
+        
+        # uint256[] return: offset word, length word, then one word per hop
+        if len(result) < 32 * (2 + len(path)):
+            raise ValueError('Invalid getAmountsOut response from router')
+        
+        return int.from_bytes(result[-32:], 'big')
+    
+    @_retry_rpc
+    async def _get_balance(self, checksum_address: str) -> int:
+        """
+        Get the native BNB balance of an address
+        
+        Args:
+            checksum_address (str): Checksummed wallet address
+            
+        Returns:
+            Balance in wei
+        """
+        return await self.w3.eth.get_balance(checksum_address)
+    
+    @_retry_rpc
+    async def _aggregate3(self, calls: List[Tuple[str, bool, str]]) -> List[Tuple[bool, bytes]]:
+        """
+        Run a batch of calls through Multicall3 in a single eth_call
+        
+        Args:
+            calls (List[Tuple[str, bool, str]]): (target, allowFailure, callData) tuples
+            
+        Returns:
+            (success, returnData) for each call, in order
+        """
+        return await self.multicall_contract.functions.aggregate3(calls).call()
+    
+    async def validate_wallet(self, address: str, include_balance: bool = True,
+                              include_tokens: bool = False) -> Dict[str, Any]:
         """
         Validate wallet address and get basic information
         
         Args:
             address (str): Wallet address to validate
+            include_balance (bool): Fetch the BNB balance (one RPC call)
+            include_tokens (bool): Also return common token balances
             
         Returns:
             Dict containing validation result and wallet info
         """
         try:
-            # Validate address format
-            checksum_address = Web3.to_checksum_address(address)
-            
-            # Check if address is valid
-            if not Web3.is_address(checksum_address):
+            # Validate address format locally, before spending any RPC call
+            try:
+                checksum_address = _to_cksum(address)
+            except (TypeError, ValueError):
                 return {
                     'success': False,
                     'error': 'Invalid wallet address format'
                 }
             
-            # Get BNB balance
-            balance_wei = self.w3.eth.get_balance(checksum_address)
-            balance_bnb = Web3.from_wei(balance_wei, 'ether')
+            if not include_balance and not include_tokens:
+                return {
+                    'success': True,
+                    'address': checksum_address,
+                    'network': 'BSC Testnet',
+                    'chain_id': 97
+                }
+            
+            if include_tokens:
+                # Native and token balances in one Multicall3 round trip
+                balance_wei, tokens = await self._fetch_portfolio(checksum_address)
+            else:
+                balance_wei = await self._get_balance(checksum_address)
             
-            return {
+            balance_bnb = _from_wei(balance_wei, 'ether')
+            
+            result = {
                 'success': True,
                 'address': checksum_address,
                 'balance_bnb': float(balance_bnb),
                 'network': 'BSC Testnet',
                 'chain_id': 97
             }
+            if include_tokens:
+                result['tokens'] = tokens
+            
+            return result
             
         except Exception as e:
             return {
@@ -146,34 +534,91 @@ class SwapService:
                 'error': f'Wallet validation failed: {str(e)}'
             }
     
-    def get_token_info(self, token_address: str) -> Dict[str, Any]:
+    async def _fetch_portfolio(self, checksum_address: str) -> Tuple[int, Dict[str, Dict[str, Any]]]:
+        """
+        Fetch the native balance and every common token balance via Multicall3
+        
+        Args:
+            checksum_address (str): Checksummed wallet address
+            
+        Returns:
+            Tuple of (native balance in wei, token balances keyed by symbol)
+        """
+        token_addresses = {
+            symbol: _to_cksum(token_address)
+            for symbol, token_address in self.common_tokens.items()
+            if _is_address(token_address)
+        }
+        
+        balance_of = self.erc20_contract.encodeABI(fn_name='balanceOf', args=[checksum_address])
+        calls = [(
+            self.multicall_contract.address,
+            False,
+            self.multicall_contract.encodeABI(fn_name='getEthBalance', args=[checksum_address])
+        )]
+        calls.extend((token_address, True, balance_of) for token_address in token_addresses.values())
+        
+        results = await self._aggregate3(calls)
+        
+        balance_wei = decode(['uint256'], results[0][1])[0]
+        tokens = {}
+        for (symbol, token_address), (success, return_data) in zip(token_addresses.items(), results[1:]):
+            balance = None
+            if success:
+                try:
+                    balance = str(decode(['uint256'], return_data)[0])
+                except DecodingError:
+                    pass  # No contract at the address, or a non-standard token
+            tokens[symbol] = {'address': token_address, 'balance': balance}
+        
+        return balance_wei, tokens
+    
+    async def get_token_info(self, token_address: str, refresh: bool = False) -> Dict[str, Any]:
         """
         Get information about a specific token
         
         Args:
             token_address (str): Token contract address
+            refresh (bool): Bypass the cache (e.g. for upgradeable proxies)
             
         Returns:
             Dict containing token information
         """
+        result = await self.get_token_infos([token_address], refresh=refresh)
+        if not result['success']:
+            return result
+        
+        return result['tokens'][0]
+    
+    async def get_token_infos(self, token_addresses: List[str], refresh: bool = False) -> Dict[str, Any]:
+        """
+        Get information about several tokens, served from cache where possible
+        
+        Args:
+            token_addresses (List[str]): Token contract addresses
+            refresh (bool): Bypass the cache (e.g. for upgradeable proxies)
+            
+        Returns:
+            Dict containing a list of per-token information
+        """
         try:
-            checksum_address = Web3.to_checksum_address(token_address)
-            token_contract = self.w3.eth.contract(
-                address=checksum_address,
-                abi=self.token_abi
-            )
+            checksum_addresses = [_to_cksum(address) for address in token_addresses]
             
-            # Get token details
-            name = token_contract.functions.name().call()
-            symbol = token_contract.functions.symbol().call()
-            decimals = token_contract.functions.decimals().call()
+            found = {}
+            if not refresh:
+                for address in checksum_addresses:
+                    info = self._token_info_cache.get(address)
+                    if info is not None:
+                        found[address] = info
+            
+            # Fetch everything not cached in a single Multicall3 round trip
+            missing = [address for address in dict.fromkeys(checksum_addresses) if address not in found]
+            if missing:
+                found.update(await self._fetch_token_infos(missing))
             
             return {
                 'success': True,
-                'address': checksum_address,
-                'name': name,
-                'symbol': symbol,
-                'decimals': decimals
+                'tokens': [found[address] for address in checksum_addresses]
             }
             
         except Exception as e:
@@ -182,9 +627,59 @@ class SwapService:
                 'error': f'Failed to get token info: {str(e)}'
             }
     
-    def get_swap_quote(self, token_in: str, token_out: str, amount_in: str) -> Dict[str, Any]:
+    async def _fetch_token_infos(self, checksum_addresses: List[str]) -> Dict[str, Dict[str, Any]]:
         """
-        Get swap quote from PancakeSwap router
+        Fetch token metadata via Multicall3 and cache the successful lookups
+        
+        Args:
+            checksum_addresses (List[str]): Unique checksummed token addresses
+            
+        Returns:
+            Dict mapping each address to its token information
+        """
+        # One Call3 per (token, field), failures are reported per token
+        calls = [
+            (address, True, calldata)
+            for address in checksum_addresses
+            for calldata in self.token_info_calldata
+        ]
+        results = await self._aggregate3(calls)
+        
+        field_count = len(TOKEN_INFO_FIELDS)
+        infos = {}
+        for index, address in enumerate(checksum_addresses):
+            token_results = results[index * field_count:(index + 1) * field_count]
+            
+            if not all(success for success, _ in token_results):
+                infos[address] = {
+                    'success': False,
+                    'address': address,
+                    'error': 'Failed to get token info: token call reverted'
+                }
+                continue
+            
+            info = {'success': True, 'address': address}
+            try:
+                for (field, abi_type), (_, return_data) in zip(TOKEN_INFO_FIELDS, token_results):
+                    info[field] = decode([abi_type], return_data)[0]
+            except (DecodingError, UnicodeDecodeError):
+                # No contract at the address, or a non-standard token
+                infos[address] = {
+                    'success': False,
+                    'address': address,
+                    'error': 'Failed to get token info: token call returned malformed data'
+                }
+                continue
+            
+            self._token_info_cache[address] = info
+            infos[address] = info
+        
+        return infos
+    
+    async def get_swap_quote(self, token_in: str, token_out: str, amount_in: str) -> Dict[str, Any]:
+        """
+        Get swap quote from PancakeSwap router, using the better of the
+        direct pair and the route via WBNB
         
         Args:
             token_in (str): Input token address
@@ -196,28 +691,59 @@ class SwapService:
         """
         try:
             # Convert addresses to checksum format
-            token_in_addr = Web3.to_checksum_address(token_in)
-            token_out_addr = Web3.to_checksum_address(token_out)
+            token_in_addr = _to_cksum(token_in)
+            token_out_addr = _to_cksum(token_out)
+            
+            # Repeat quotes within the same block are served from cache
+            cache_key = (token_in_addr, token_out_addr, int(amount_in))
+            quote = self._quote_cache.get(cache_key)
+            if quote is not None:
+                return quote
             
-            # Create path for swap
-            path = [token_in_addr, token_out_addr]
+            # Stamp the block before the RPC so a block landing mid-flight
+            # cannot make a pre-block quote look current
+            quote_block = self.current_block
+            
+            # Quote the direct pair and the route via WBNB concurrently
+            paths = [[token_in_addr, token_out_addr]]
+            wbnb_addr = _to_cksum(self.common_tokens['WBNB'])
+            if wbnb_addr not in (token_in_addr, token_out_addr):
+                paths.append([token_in_addr, wbnb_addr, token_out_addr])
+            
+            results = await asyncio.gather(
+                *(self._get_amounts_out(int(amount_in), path) for path in paths),
+                return_exceptions=True
+            )
             
-            # Get amounts out from router
-            amounts_out = self.router_contract.functions.getAmountsOut(
-                int(amount_in), path
-            ).call()
+            # Keep the best route that the router could quote
+            routes = [
+                (result, path) for result, path in zip(results, paths)
+                if not isinstance(result, BaseException)
+            ]
+            if not routes:
+                raise results[0]
+            
+            amount_out, path = max(routes, key=lambda route: route[0])
             
             # Calculate price impact and other metrics
-            amount_out = amounts_out[-1]
             
-            return {
+            quote = {
                 'success': True,
                 'amount_in': amount_in,
                 'amount_out': str(amount_out),
                 'path': path,
                 'price_impact': 0.1,  # Simplified calculation
-                'minimum_received': str(int(amount_out * 0.995))  # 0.5% slippage
+                'minimum_received': str(int(amount_out * 0.995)),  # 0.5% slippage
+                'quote_block': quote_block,
+                'quote_signature': self._sign_quote(
+                    token_in_addr, token_out_addr, int(amount_in), amount_out, quote_block
+                )
             }
+            # A new block landed while quoting: the cache was cleared for it
+            if self.current_block == quote_block:
+                self._quote_cache[cache_key] = quote
+            
+            return quote
             
         except Exception as e:
             return {
@@ -225,8 +751,11 @@ class SwapService:
                 'error': f'Quote calculation failed: {str(e)}'
             }
     
-    def execute_swap(self, wallet_address: str, token_in: str, token_out: str, 
-                    amount_in: str, slippage: float = 0.5) -> Dict[str, Any]:
+    async def execute_swap(self, wallet_address: str, token_in: str, token_out: str, 
+                          amount_in: str, slippage: float = 0.5,
+                          expected_amount_out: Optional[int] = None,
+                          quote_block: Optional[int] = None,
+                          quote_signature: Optional[str] = None) -> Dict[str, Any]:
         """
         Execute token swap (simulation for testnet)
         
@@ -241,6 +770,9 @@ class SwapService:
             token_out (str): Output token address
             amount_in (str): Input amount in wei
             slippage (float): Slippage tolerance percentage
+            expected_amount_out (Optional[int]): Output amount from a prior quote, in wei
+            quote_block (Optional[int]): Block the prior quote was taken at
+            quote_signature (Optional[str]): Signature returned with the prior quote
             
         Returns:
             Dict containing swap execution result
@@ -249,21 +781,27 @@ class SwapService:
             # For demo purposes, we'll simulate a successful swap
             # In production, this would interact with user's wallet via frontend
             
-            # Get quote first
-            quote = self.get_swap_quote(token_in, token_out, amount_in)
-            if not quote['success']:
-                return quote
+            # Reuse the frontend's signed quote while it is fresh, else re-quote
+            amount_out = self._reusable_quote_amount(
+                _to_cksum(token_in), _to_cksum(token_out),
+                int(amount_in), expected_amount_out, quote_block, quote_signature
+            )
+            if amount_out is None:
+                quote = await self.get_swap_quote(token_in, token_out, amount_in)
+                if not quote['success']:
+                    return quote
+                amount_out = int(quote['amount_out'])
             
             # Calculate minimum amount out with slippage
-            amount_out = int(quote['amount_out'])
             slippage_multiplier = (100 - slippage) / 100
             amount_out_min = int(amount_out * slippage_multiplier)
             
             # Simulate transaction hash (in production, this would be real)
-            import hashlib
             import time
             tx_data = f"{wallet_address}{token_in}{token_out}{amount_in}{time.time()}"
-            tx_hash = hashlib.sha256(tx_data.encode()).hexdigest()
+            # Non-cryptographic demo ID: blake2b is cheaper than sha256 and
+            # yields the same 32-byte (64 hex char) width as a real tx hash
+            tx_hash = hashlib.blake2b(tx_data.encode(), digest_size=32).hexdigest()
             
             return {
                 'success': True,
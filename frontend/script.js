@@ -55,7 +55,8 @@ const AppState = {
     isConnected: false,
     currentLevel: 1,
     currentXP: 0,
-    questLog: []
+    questLog: [],
+    lastQuote: null
 };
 
 /**
@@ -517,6 +518,16 @@ async function calculateExpectedOutput() {
         const result = await response.json();
         
         if (result.success) {
+            // Remember the signed quote so the swap can skip re-quoting
+            AppState.lastQuote = {
+                tokenIn: fromToken,
+                tokenOut: toToken,
+                amountIn: amountWei.toString(),
+                amountOut: result.amount_out,
+                quoteBlock: result.quote_block,
+                quoteSignature: result.quote_signature
+            };
+            
             const outputAmount = AppState.web3.utils.fromWei(result.amount_out, 'ether');
             const toTokenSymbol = getTokenSymbolByAddress(toToken);
             
@@ -624,6 +635,13 @@ async function executeSwap(formData) {
         // Convert amount to wei
         const amountWei = AppState.web3.utils.toWei(formData.amount.toString(), 'ether');
         
+        // Pass along the matching signed quote, if any
+        const quote = AppState.lastQuote;
+        const quoteMatches = quote &&
+            quote.tokenIn === formData.fromToken &&
+            quote.tokenOut === formData.toToken &&
+            quote.amountIn === amountWei.toString();
+        
         // Execute swap via backend
         const response = await fetch(`${CONFIG.API_BASE_URL}/api/execute-swap`, {
             method: 'POST',
@@ -635,7 +653,12 @@ async function executeSwap(formData) {
                 tokenIn: formData.fromToken,
                 tokenOut: formData.toToken,
                 amountIn: amountWei,
-                slippage: parseFloat(formData.slippage)
+                slippage: parseFloat(formData.slippage),
+                ...(quoteMatches && {
+                    expectedAmountOut: quote.amountOut,
+                    quoteBlock: quote.quoteBlock,
+                    quoteSignature: quote.quoteSignature
+                })
             })
         });
         